@@ -2,14 +2,21 @@ import bz2
 from collections import deque
 import gzip
 from io import BytesIO
+from itertools import compress, count
+from multiprocessing.pool import ThreadPool
+from operator import itemgetter, methodcaller
 import os
 import re
 import string
+import struct
+from tempfile import SpooledTemporaryFile
 import warnings
+import zlib
 
 from onecodex.exceptions import ValidationError, ValidationWarning
 
 GZIP_COMPRESSION_LEVEL = 5
+SPOOL_MEMORY_SIZE = 1024 * 1024 * 16  # spooled output smaller than this never touches the disk
 
 
 # buffer code from
@@ -17,6 +24,7 @@ GZIP_COMPRESSION_LEVEL = 5
 class Buffer(object):
     def __init__(self):
         self._buf = deque()
+        self._offset = 0
         self._size = 0
         self.closed = False
 
@@ -32,12 +40,17 @@ class Buffer(object):
             size = self._size
         ret_list = []
         while size > 0 and len(self._buf):
-            s = self._buf.popleft()
-            size -= len(s)
-            ret_list.append(s)
-        if size < 0:
-            ret_list[-1], remainder = ret_list[-1][:size], ret_list[-1][size:]
-            self._buf.appendleft(remainder)
+            s = self._buf[0]
+            # only copy out what was asked for; re-slicing the remainder of a large
+            # chunk on every read would make draining it quadratic
+            piece = s[self._offset:self._offset + size]
+            if self._offset + len(piece) == len(s):
+                self._buf.popleft()
+                self._offset = 0
+            else:
+                self._offset += len(piece)
+            size -= len(piece)
+            ret_list.append(piece)
         ret = b''.join(ret_list)
         self._size -= len(ret)
         return ret
@@ -49,15 +62,46 @@ class Buffer(object):
         self.closed = True
 
 
+# BGZF (https://samtools.github.io/hts-specs/SAMv1.pdf) is a series of independent gzip members,
+# each holding at most 64kb and recording its own size in a header extra field
+BGZF_BLOCK_SIZE = 0xff00  # uncompressed; leaves room for incompressible data in a 64kb block
+BGZF_HEADER = b'\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff\x06\x00BC\x02\x00'
+BGZF_EOF = (b'\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff\x06\x00BC\x02\x00'
+            b'\x1b\x00\x03\x00\x00\x00\x00\x00\x00\x00\x00\x00')
+
+
+def bgzf_compress(data, compresslevel=GZIP_COMPRESSION_LEVEL):
+    """Compress `data` into BGZF blocks (without the EOF marker block)."""
+    blocks = []
+    for start in range(0, len(data), BGZF_BLOCK_SIZE):
+        block = data[start:start + BGZF_BLOCK_SIZE]
+        compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS)
+        deflated = compressor.compress(block) + compressor.flush()
+        # BSIZE is the total block size - 1: the 18 byte header + data + the 8 byte footer
+        blocks.extend((BGZF_HEADER, struct.pack('<H', len(deflated) + 25), deflated,
+                       struct.pack('<II', zlib.crc32(block) & 0xffffffff, len(block))))
+    return b''.join(blocks)
+
+
 class GzipBuffer(object):
-    def __init__(self):
+    def __init__(self, threads=1):
         self._buf = Buffer()
-        self._gzip = gzip.GzipFile(None, mode='wb', fileobj=self._buf,
-                                   compresslevel=GZIP_COMPRESSION_LEVEL)
         self._reads_buffer = Buffer()
         self.MAX_READS_BUFFER_SIZE = 1024 * 256  # 256kb
         self.closed = False
 
+        if threads > 1:
+            # zlib releases the GIL so each flush can be compressed on another thread (as
+            # BGZF blocks, which are valid gzip data when written out in order)
+            self._gzip = None
+            self._pool = ThreadPool(threads)
+            self._pending = deque()
+            self.max_pending = 2 * threads
+        else:
+            self._gzip = gzip.GzipFile(None, mode='wb', fileobj=self._buf,
+                                       compresslevel=GZIP_COMPRESSION_LEVEL)
+            self._pool = None
+
     def __len__(self):
         return len(self._buf)
 
@@ -69,13 +113,32 @@ class GzipBuffer(object):
     def read(self, size=-1):
         return self._buf.read(size)
 
+    def _collect(self, wait=False):
+        while len(self._pending) > 0 and (wait or self._pending[0].ready()):
+            self._buf.write(self._pending.popleft().get())
+
     def flush(self):
-        self._gzip.write(self._reads_buffer.read())
+        if self._pool is None:
+            self._gzip.write(self._reads_buffer.read())
+            return
+
+        self._pending.append(self._pool.apply_async(bgzf_compress, (self._reads_buffer.read(),)))
+        self._collect()
+        # don't let the parsing run too far ahead of the compression
+        while len(self._pending) >= self.max_pending:
+            self._buf.write(self._pending.popleft().get())
 
     def close(self):
+        if self.closed:
+            return
         if len(self._reads_buffer) > 0:
             self.flush()
-        self._gzip.close()
+        if self._pool is None:
+            self._gzip.close()
+        else:
+            self._collect(wait=True)
+            self._buf.write(BGZF_EOF)
+            self._pool.close()
         self.closed = True
 
 
@@ -88,6 +151,39 @@ else:
     OTHER_BASE_TRANS = string.maketrans(b'BDHIKMRSUVWXYbdhikmrsuvwxy',
                                         b'NNNNNNNNTNNNNnnnnnnnntnnnn')
 
+# the characters allowed in a sequence; these mirror the `valid_bases` regexes below
+# (including `\s`) and are deleted en masse to check a whole chunk at once
+VALID_BASES = b'ACGTNacgtn \t\n\r\x0b\x0c'
+VALID_IUPAC_BASES = b'ABCDGHIKMNRSTUVWXYabcdghikmnrstuvwxy \t\n\r\x0b\x0c'
+
+# single bytes as returned by indexing into a bytes object (an int on py3, a str on py2)
+FASTA_MARKER = b'>'[0]
+FASTQ_MARKER = b'@'[0]
+FASTQ_SEPARATOR = b'+'[0]
+
+
+class FASTXChunk(object):
+    """
+    A run of complete records parsed out of the read buffer in one go.
+
+    `block` holds the records formatted exactly as they're yielded one-by-one (so it can be
+    written downstream as is) and `end` is how much of the read buffer they consumed.
+    """
+    def __init__(self, end, block, n_records, records):
+        self.end = end
+        self.block = block
+        self.n_records = n_records
+        self._records = records
+
+    def __len__(self):
+        return self.n_records
+
+    def records(self):
+        """(seq_id, seq, seq_id2, qual) tuples for each record in the chunk"""
+        if callable(self._records):
+            self._records = self._records()
+        return self._records
+
 
 class FASTXNuclIterator(object):
     def __init__(self, file_obj, allow_iupac=False, check_filename=True, as_raw=False,
@@ -98,8 +194,8 @@ class FASTXNuclIterator(object):
             self.name = 'File'
 
         self._set_file_obj(file_obj, check_filename=check_filename)
-        self.unchecked_buffer = b''
         self.seq_reader = self._generate_seq_reader(False)
+        self.last_seq_reader = self._generate_seq_reader(True)
         self.allow_iupac = allow_iupac
         self.validate = validate
         self.modified = False
@@ -107,14 +203,18 @@ class FASTXNuclIterator(object):
         if self.allow_iupac:
             self.valid_bases = re.compile(b'[^ABCDGHIKMNRSTUVWXYabcdghikmnrstuvwxy\s]')
             self.valid_bases_match = re.compile(b'^[ABCDGHIKMNRSTUVWXYabcdghikmnrstuvwxy\s]*$')
+            self.valid_bases_delete = VALID_IUPAC_BASES
         else:
             self.valid_bases = re.compile(b'[^ACGTNacgtn\s]')
             self.valid_bases_match = re.compile(b'^[ACGTNacgtn\s]*$')
+            self.valid_bases_delete = VALID_BASES
         self.as_raw = as_raw
 
         self._set_total_size()
         self.processed_size = self.file_obj.tell()
         self.warnings = set()
+        self.read_bytes = 0
+        self.copied_bytes = 0
 
     def _set_file_obj(self, file_obj, check_filename=True):
         """
@@ -161,6 +261,10 @@ class FASTXNuclIterator(object):
         else:
             raise ValidationError('{} is not valid FASTX'.format(self.name))
 
+        # the unchecked data always starts at the beginning of a record (i.e. with its @/>);
+        # it's kept as a list of complete lines plus the pieces of the line being read in
+        self.unchecked_lines = []
+        self.partial_line = [start]
         self.file_obj = file_obj
 
     def _set_total_size(self):
@@ -232,44 +336,266 @@ class FASTXNuclIterator(object):
 
         return seq_id, seq, seq_id2, qual
 
-    def __iter__(self):
+    def _format_record(self, seq_id, seq, seq_id2, qual):
+        if self.file_type == 'FASTA':
+            return b'>' + seq_id + b'\n' + seq + b'\n'
+        elif self.file_type == 'FASTQ':
+            return (b'@' + seq_id + b'\n' + seq +
+                    b'\n+' + seq_id2 + b'\n' + qual + b'\n')
+
+    def _parse_chunk(self, lines, eof):
+        """
+        Parse every complete record in `lines` at once, returning a FASTXChunk or None if the
+        chunk needs to be handled record-by-record (malformed records, invalid characters or
+        tabs in headers) so we fail and warn exactly like the regex parser does.
+
+        Unless at the end of the file, the last of `lines` is the (start of the) line that's
+        still being read in.
+        """
+        if len(lines) == 0 or lines == [b'']:
+            return FASTXChunk(0, b'', 0, [])
+        if self.file_type == 'FASTA':
+            return self._parse_fasta_chunk(lines, eof)
+        return self._parse_fastq_chunk(lines, eof)
+
+    def _parse_fasta_chunk(self, lines, eof):
+        chunk = self._parse_single_line_fasta_chunk(lines, eof)
+        if chunk is not None:
+            return chunk
+
+        headers = list(compress(count(), map(methodcaller('startswith', b'>'), lines)))
+        if len(headers) == 0 or headers[0] != 0:
+            return None
+        if eof:
+            headers.append(len(lines))
+        # the last record isn't complete until we see the start of the next one
+        n_records = len(headers) - 1
+        if n_records == 0:
+            return FASTXChunk(0, b'', 0, [])
+
+        id_lines = [lines[ix] for ix in headers[:-1]]
+        if min(map(len, id_lines)) < 2:
+            return None
+        seqs = [b'\n'.join(lines[start + 1:end]) for start, end in zip(headers, headers[1:])]
+        if b'' in seqs:
+            return None
+
+        end = headers[-1]
+        block = b'\n'.join(lines[:end] + [b''])
+        return self._validate_fasta_chunk(end, block, id_lines, seqs)
+
+    def _parse_single_line_fasta_chunk(self, lines, eof):
+        # most FASTA files from sequencers don't wrap their sequences so we can
+        # skip looking for where every record starts
+        if eof:
+            if len(lines) % 2 != 0:
+                return None
+            n_records = len(lines) // 2
+        else:
+            n_records = (len(lines) - 1) // 2
+            if n_records > 0 and len(lines[2 * n_records]) == 0:
+                n_records -= 1
+        if n_records == 0:
+            return None
+
+        n_lines = 2 * n_records
+        # this includes the header of the next record too, which must start with a >
+        id_lines = lines[0:n_lines + 1:2]
+        seqs = lines[1:n_lines:2]
+        try:
+            if set(map(itemgetter(0), id_lines)) != {FASTA_MARKER}:
+                return None
+        except IndexError:
+            return None
+        id_lines = id_lines[:n_records]
+        if min(map(len, id_lines)) < 2 or b'' in seqs:
+            return None
+
+        block = b'\n'.join(lines[:n_lines] + [b''])
+        return self._validate_fasta_chunk(n_lines, block, id_lines, seqs)
+
+    def _validate_fasta_chunk(self, end, block, id_lines, seqs):
+        seq_blob = b''.join(seqs)
+        if b'>' in seq_blob:
+            return None
+
+        if self.validate:
+            if b'\t' in b''.join(id_lines):
+                return None
+            if seq_blob.translate(None, self.valid_bases_delete):
+                return None
+            if self.allow_iupac and OTHER_BASES.search(seq_blob) is not None:
+                self._warn_once('Translating other bases in {} (X->N,U->T)'.format(self.name))
+                seqs = b'>'.join(seqs).translate(OTHER_BASE_TRANS).split(b'>')
+                block = b''.join(id_line + b'\n' + seq + b'\n'
+                                 for id_line, seq in zip(id_lines, seqs))
+
+        def records():
+            return [(id_line[1:], seq, b'', None) for id_line, seq in zip(id_lines, seqs)]
+
+        return FASTXChunk(end, block, len(seqs), records)
+
+    def _parse_fastq_chunk(self, lines, eof):
+        if eof:
+            if len(lines) % 4 != 0:
+                return None
+            n_records = len(lines) // 4
+        else:
+            n_records = (len(lines) - 1) // 4
+            if n_records > 0 and len(lines[4 * n_records]) == 0:
+                # the last record isn't complete until we see the start of the next one
+                n_records -= 1
+        if n_records == 0:
+            return FASTXChunk(0, b'', 0, [])
+
+        n_lines = 4 * n_records
+        # this includes the header of the next record too, which must start with an @
+        id_lines = lines[0:n_lines + 1:4]
+        seqs = lines[1:n_lines:4]
+        id2_lines = lines[2:n_lines:4]
+        quals = lines[3:n_lines:4]
+        try:
+            if set(map(itemgetter(0), id_lines)) != {FASTQ_MARKER} or \
+                    set(map(itemgetter(0), id2_lines)) != {FASTQ_SEPARATOR}:
+                return None
+        except IndexError:
+            # an empty line where a header should be
+            return None
+        id_lines = id_lines[:n_records]
+        if min(map(len, id_lines)) < 2:
+            return None
+
+        block = None
+        if self.validate:
+            if b'\t' in b''.join(id_lines) or b'\t' in b''.join(id2_lines):
+                return None
+            seq_blob = b''.join(seqs)
+            if seq_blob.translate(None, self.valid_bases_delete):
+                return None
+            if self.allow_iupac and OTHER_BASES.search(seq_blob) is not None:
+                self._warn_once('Translating other bases in {} (X->N,U->T)'.format(self.name))
+                seqs = b'\n'.join(seqs).translate(OTHER_BASE_TRANS).split(b'\n')
+                block = b'\n'.join(b'\n'.join(rec) for rec in zip(id_lines, seqs, id2_lines, quals))
+                block += b'\n'
+        if block is None:
+            block = b'\n'.join(lines[:n_lines] + [b''])
+
+        def records():
+            return [(seq_id[1:], seq, seq_id2[1:], qual)
+                    for seq_id, seq, seq_id2, qual in zip(id_lines, seqs, id2_lines, quals)]
+
+        return FASTXChunk(n_lines, block, n_records, records)
+
+    def _parse_chunk_by_record(self, data, eof):
+        """
+        Regex-based parser that handles (and validates) one record at a time, yielding a
+        single-record FASTXChunk for each.
+        """
+        # the last record doesn't have a @/> on the next line so we use a different regex
+        seq_reader = self.last_seq_reader if eof else self.seq_reader
+        end = 1  # skip the @/> starting the buffer
+        while True:
+            match = seq_reader.match(data, end)
+            if match is None:
+                break
+            rec = self._validate_record(match.groupdict())
+            end = match.end()
+            # (the non-last regex also consumes the next record's @/>, which stays in the buffer)
+            yield FASTXChunk(end if eof else end - 1, self._format_record(*rec), 1, [rec])
+
+    def _add_data(self, data):
+        """
+        Split newly read data onto the unchecked lines. Only the line that straddles the end of
+        the previous read gets copied (and only once it's complete).
+        """
+        self.read_bytes += len(data)
+        new_lines = data.split(b'\n')
+        if len(new_lines) == 1:
+            self.partial_line.append(data)
+            return
+
+        if len(self.partial_line) > 0:
+            self.partial_line.append(new_lines[0])
+            new_lines[0] = self._join_partial_line()
+        self.unchecked_lines.extend(new_lines[:-1])
+        self.partial_line = [new_lines[-1]] if len(new_lines[-1]) > 0 else []
+
+    def _join_partial_line(self):
+        line = b''.join(self.partial_line)
+        if len(self.partial_line) > 1:
+            self.copied_bytes += len(line)
+        self.partial_line = []
+        return line
+
+    def _join_unchecked(self, eof=False):
+        # (at the end of the file, any partial line has already been moved onto the lines)
+        lines = self.unchecked_lines if eof else self.unchecked_lines + [self._join_partial_line()]
+        data = b'\n'.join(lines)
+        self.copied_bytes += len(data)
+        return data
+
+    def _set_unchecked(self, data):
+        self.copied_bytes += len(data)
+        lines = data.split(b'\n')
+        self.unchecked_lines = lines[:-1]
+        self.partial_line = [lines[-1]] if len(lines[-1]) > 0 else []
+
+    @property
+    def copied_bytes_per_mb(self):
+        """Bytes copied while carrying unparsed data between reads, per MB of data read"""
+        if self.read_bytes == 0:
+            return 0.
+        return self.copied_bytes / (self.read_bytes / (1024. * 1024))
+
+    def iter_chunks(self):
+        """
+        Yields FASTXChunks of validated records, reading `buffer_read_size` bytes at a time.
+        """
         eof = False
         while not eof:
             new_data = self.file_obj.read(self.buffer_read_size)
             # if we're at the end of the file
             if len(new_data) == 0:
-                # switch to a different regex to parse without a next record
                 eof = True
-                self.seq_reader = self._generate_seq_reader(True)
+                lines = self.unchecked_lines
+                if len(self.partial_line) > 0:
+                    lines.append(self._join_partial_line())
                 # automatically remove newlines from the end of the file (they get added back in
                 # by the formatting operation below, but otherwise they mess up the regex and you
                 # end up with two terminating \n's)
-                self.unchecked_buffer = self.unchecked_buffer.rstrip(b'\n')
+                while len(lines) > 0 and len(lines[-1]) == 0:
+                    lines.pop()
             else:
-                self.unchecked_buffer += new_data
-
-            end = 0
-            while True:
-                match = self.seq_reader.match(self.unchecked_buffer, end)
-                if match is None:
-                    break
-                rec = match.groupdict()
-                seq_id, seq, seq_id2, qual = self._validate_record(rec)
-                if self.as_raw:
-                    yield (seq_id, seq, qual)
-                elif self.file_type == 'FASTA':
-                    yield b'>' + seq_id + b'\n' + seq + b'\n'
-                elif self.file_type == 'FASTQ':
-                    yield (b'@' + seq_id + b'\n' + seq +
-                           b'\n+' + seq_id2 + b'\n' + qual + b'\n')
-                end = match.end()
+                self._add_data(new_data)
+                # (we only need the first byte of the line still being read in)
+                lines = self.unchecked_lines + [self.partial_line[0] if self.partial_line else b'']
+
+            chunk = self._parse_chunk(lines, eof)
+            if chunk is not None:
+                if len(chunk) > 0:
+                    yield chunk
+                self.unchecked_lines = self.unchecked_lines[chunk.end:]
+            else:
+                data = self._join_unchecked(eof)
+                end = 0
+                for chunk in self._parse_chunk_by_record(data, eof):
+                    end = chunk.end
+                    yield chunk
+                self._set_unchecked(data[end:])
 
             if hasattr(self.file_obj, 'fileobj'):
                 # for gzip files, get the amount read of the gzipped file (which is wrapped inside)
                 self.processed_size = self.file_obj.fileobj.tell()
             else:
                 self.processed_size = self.file_obj.tell()
-            self.unchecked_buffer = self.unchecked_buffer[end:]
+
+    def __iter__(self):
+        for chunk in self.iter_chunks():
+            for seq_id, seq, seq_id2, qual in chunk.records():
+                if self.as_raw:
+                    yield (seq_id, seq, qual)
+                else:
+                    yield self._format_record(seq_id, seq, seq_id2, qual)
 
     @property
     def bytes_left(self):
@@ -356,15 +682,24 @@ class BaseFASTXReader(object):
 
 class FASTXTranslator(BaseFASTXReader):
     def __init__(self, *args, **kwargs):
+        # if set, the output translated while calculating `len` is kept (up to `spool_size`
+        # bytes) and replayed afterwards instead of parsing and compressing everything again
+        self.spool_size = kwargs.pop('spool_size', None)
+        self.spool = None
+        threads = kwargs.pop('threads', 1)
         super(FASTXTranslator, self).__init__(*args, **kwargs)
+        self._saved_args['threads'] = threads
         if kwargs.get('recompress', True):
-            self.checked_buffer = GzipBuffer()
+            self.checked_buffer = GzipBuffer(threads=threads)
         else:
             self.checked_buffer = Buffer()
+        self.validating = False
 
     def _set_read(self, file_obj, **kwargs):
         self.reads = FASTXNuclIterator(file_obj, **kwargs)
         self.reads_iter = iter(self.reads)
+        # unpaired reads don't need to be split into records to be written out
+        self.reads_chunks = self.reads.iter_chunks()
 
     def _set_pair(self, pair, **kwargs):
         self.reads_pair = FASTXNuclIterator(pair, **kwargs)
@@ -380,23 +715,38 @@ class FASTXTranslator(BaseFASTXReader):
             for r in self.reads_iter:
                 yield r
 
+    def _processed_size(self):
+        if self.reads_pair is None:
+            return self.reads.processed_size
+        return self.reads.processed_size + self.reads_pair.processed_size
+
     def read(self, n=-1):
+        if self.spool is not None and self.total is not None:
+            bytes_reads = self.spool.read(n)
+            self.total_written += len(bytes_reads)
+            if self.progress_callback is not None:
+                # report progress in terms of the input file(s) like we do when translating
+                self.progress_callback(self.reads.name,
+                                       self._processed_size() * self.total_written // self.total,
+                                       validation=False)
+            return bytes_reads
+
         if self.reads_pair is None:
             while len(self.checked_buffer) < n or n < 0:
                 try:
-                    record = next(self.reads_iter)
+                    chunk = next(self.reads_chunks)
                 except StopIteration:
-                    record = None
+                    chunk = None
 
-                if record is not None:
-                    self.checked_buffer.write(record)
-                elif record is None:
+                if chunk is not None:
+                    self.checked_buffer.write(chunk.block)
+                elif chunk is None:
                     self.checked_buffer.close()
                     break
 
                 if self.progress_callback is not None:
                     self.progress_callback(self.reads.name, self.reads.processed_size,
-                                           validation=(not self.reads.validate))
+                                           validation=self.validating)
         else:
             while len(self.checked_buffer) < n or n < 0:
                 try:
@@ -419,9 +769,8 @@ class FASTXTranslator(BaseFASTXReader):
                                           "same number of records")
 
                 if self.progress_callback is not None:
-                    bytes_uploaded = self.reads.processed_size + self.reads_pair.processed_size
-                    self.progress_callback(self.reads.name, bytes_uploaded,
-                                           validation=(not self.reads.validate))
+                    self.progress_callback(self.reads.name, self._processed_size(),
+                                           validation=self.validating)
 
         bytes_reads = self.checked_buffer.read(n)
         self.total_written += len(bytes_reads)
@@ -440,12 +789,28 @@ class FASTXTranslator(BaseFASTXReader):
         # Properly ensure requests_toolbelt reads the entirety of the
         # file *plus* the remaining buffer object
         if self.total is None:
-            self.reads.validate = False
-            if self.reads_pair:
-                self.reads_pair.validate = False
-            while len(self.read(8192)) != 0:
-                pass
+            self.validating = True
+            if self.spool_size is not None:
+                # validate on this pass since the output is what will be uploaded
+                self.spool = SpooledTemporaryFile(max_size=min(self.spool_size,
+                                                               SPOOL_MEMORY_SIZE))
+            else:
+                self.reads.validate = False
+                if self.reads_pair:
+                    self.reads_pair.validate = False
+            while True:
+                bytes_reads = self.read(1024 * 64)
+                if len(bytes_reads) == 0:
+                    break
+                if self.spool is None:
+                    continue
+                if self.spool.tell() + len(bytes_reads) > self.spool_size:
+                    # too big to keep around; we'll just translate it all again in `seek`
+                    self.clear_spool()
+                else:
+                    self.spool.write(bytes_reads)
             self.total = self.total_written
+            self.validating = False
             self.seek(0)
         return self.total - self.total_written
 
@@ -459,6 +824,11 @@ class FASTXTranslator(BaseFASTXReader):
 
     def seek(self, loc):
         assert loc == 0  # we can only rewind all the way
+        if self.spool is not None:
+            self.spool.seek(0)
+            self.total_written = 0
+            return
+
         reads = self.reads.file_obj
         reads.seek(0)
         if self.reads_pair:
@@ -475,8 +845,14 @@ class FASTXTranslator(BaseFASTXReader):
     def write(self, b):
         raise NotImplementedError
 
+    def clear_spool(self):
+        if self.spool is not None:
+            self.spool.close()
+            self.spool = None
+
     def close(self):
         assert len(self.checked_buffer) == 0
+        self.clear_spool()
         self.reads.close()
         if self.reads_pair is not None:
             self.reads_pair.close()
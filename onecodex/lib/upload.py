@@ -20,6 +20,7 @@ from onecodex.exceptions import UploadException, process_api_error
 
 MULTIPART_SIZE = 5 * 1000 * 1000 * 1000
 DEFAULT_UPLOAD_THREADS = 4
+MAX_SPOOL_SIZE = 2 * 1000 * 1000 * 1000  # of validated, compressed output kept for uploading
 
 
 def _file_stats(filename, validate=True):
@@ -45,7 +46,7 @@ def _file_stats(filename, validate=True):
     return final_filename, file_size
 
 
-def _wrap_files(filename, logger=None, validate=True):
+def _wrap_files(filename, logger=None, validate=True, spool_size=None, threads=1):
     """
     A little helper to wrap a sequencing file (or join and wrap R1/R2 pairs)
     and return a merged file_object
@@ -54,10 +55,12 @@ def _wrap_files(filename, logger=None, validate=True):
         if not validate:
             raise UploadException('Validation is required in order to auto-interleave files.')
         file_obj = FASTXTranslator(open(filename[0], 'rb'), pair=open(filename[1], 'rb'),
-                                   progress_callback=logger)
+                                   progress_callback=logger, spool_size=spool_size,
+                                   threads=threads)
     else:
         if validate:
-            file_obj = FASTXTranslator(open(filename, 'rb'), progress_callback=logger)
+            file_obj = FASTXTranslator(open(filename, 'rb'), progress_callback=logger,
+                                       spool_size=spool_size, threads=threads)
         else:
             file_obj = FASTXReader(open(filename, 'rb'), progress_callback=logger)
 
@@ -69,7 +72,7 @@ def upload(files, session, samples_resource, server_url, threads=DEFAULT_UPLOAD_
     """
     Uploads several files to the One Codex server, auto-detecting sizes and using the appropriate
     downstream upload functions. Also, wraps the files with a streaming validator to ensure they
-    work.
+    work. `threads` is used both for uploading and for compressing the validated files.
     """
     if threads is None:
         threads = 1
@@ -153,7 +156,8 @@ def upload(files, session, samples_resource, server_url, threads=DEFAULT_UPLOAD_
     uploading_files = []
     for file_path, filename, file_size in zip(files, filenames, file_sizes):
         if file_size < MULTIPART_SIZE:
-            file_obj = _wrap_files(file_path, logger=progress_bar, validate=validate)
+            file_obj = _wrap_files(file_path, logger=progress_bar, validate=validate,
+                                   spool_size=MAX_SPOOL_SIZE, threads=threads)
             file_uuid = threaded_upload(file_obj, filename, session, samples_resource, log_to,
                                         metadata, tags)
             if file_uuid:
@@ -174,7 +178,8 @@ def upload(files, session, samples_resource, server_url, threads=DEFAULT_UPLOAD_
     # lastly, upload all the very big files sequentially
     for file_path, filename, file_size in zip(files, filenames, file_sizes):
         if file_size >= MULTIPART_SIZE:
-            file_obj = _wrap_files(file_path, logger=progress_bar, validate=validate)
+            file_obj = _wrap_files(file_path, logger=progress_bar, validate=validate,
+                                   threads=threads)
             upload_large_file(file_obj, filename, session, samples_resource, server_url,
                               threads=threads, log_to=log_to)
             file_obj.close()
@@ -263,17 +268,19 @@ def upload_file(file_obj, filename, session, samples_resource, log_to, metadata,
 
         # If it isn't being modified and is already compressed, don't bother re-parsing it
         if not file_obj.modified and file_obj.is_gzipped:
+            file_obj.clear_spool()
             file_obj = FASTXReader(file_obj.reads.file_obj.fileobj,
                                    progress_callback=file_obj.progress_callback)
 
     multipart_fields['file'] = (filename, file_obj, 'application/x-gzip')
-    encoder = MultipartEncoder(multipart_fields)
-    content_type = encoder.content_type
 
     # try to upload the file, retrying as necessary
     max_retries = 3
     n_retries = 0
     while n_retries < max_retries:
+        # the encoder can't be rewound, so make a new one for each attempt
+        encoder = MultipartEncoder(multipart_fields)
+        content_type = encoder.content_type
         try:
             upload_request = session.post(upload_url, data=encoder,
                                           headers={'Content-Type': content_type}, auth={})
@@ -306,7 +313,7 @@ def upload_file(file_obj, filename, session, samples_resource, log_to, metadata,
                     pass
 
             n_retries += 1
-            # reset the file_obj back to the start; we may need to rebuild the encoder too?
+            # reset the file_obj back to the start (this replays the spooled output, if any)
             file_obj.seek(0)
             if n_retries == max_retries:
                 raise UploadException(
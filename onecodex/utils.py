@@ -38,7 +38,7 @@ OPTION_HELP = {
     'api_key': 'Manually provide a One Codex API key',
     'no_pprint': 'Do not pretty-print JSON responses',
     'threads': 'Do not use multiple background threads to upload files',  # noqa
-    'max_threads': 'Specify a different max # of upload threads (defaults to 4)',  # noqa
+    'max_threads': 'Specify a different max # of upload and compression threads (defaults to 4)',  # noqa
     'verbose': 'Log extra information to STDERR',
     'results': 'Get a JSON array of the metagenomic classification results table',
     'readlevel': 'Get the read-level data as a .tsv file',
@@ -2,13 +2,16 @@ import bz2
 import gzip
 from io import BytesIO
 import random
+import struct
 import sys
+import time
 import warnings
 
 import pytest
 
 from onecodex.exceptions import ValidationError, ValidationWarning
-from onecodex.lib.inline_validator import FASTXNuclIterator, FASTXReader, FASTXTranslator
+from onecodex.lib.inline_validator import (BGZF_EOF, FASTXNuclIterator, FASTXReader,
+                                           FASTXTranslator)
 
 
 # Sample files
@@ -216,3 +219,129 @@ def test_wrapper_speed():
                       for i in range(200))
     wrapper = FASTXTranslator(BytesIO(data))
     assert len(wrapper.read()) < len(data)
+
+
+@pytest.mark.parametrize('spool_size', [None, 1024, 1024 * 1024])
+def test_translator_spool(spool_size):
+    long_seq = b'ACGT' * 20
+    data = b'\n'.join(b'>header_' + str(i).encode() + b'\n' + long_seq + b'\n'
+                      for i in range(2000))
+    expected = FASTXTranslator(BytesIO(data), recompress=False).read()
+
+    wrapper = FASTXTranslator(BytesIO(data), recompress=False, spool_size=spool_size)
+    reads = wrapper.reads
+    assert len(wrapper) == len(expected)
+    assert wrapper.read(100) == expected[:100]
+    wrapper.seek(0)
+    assert len(wrapper) == len(expected)
+    assert wrapper.read() == expected
+
+    if spool_size is not None and spool_size > len(expected):
+        # replayed from the spool, so the input was only parsed once
+        assert wrapper.reads is reads
+    else:
+        assert wrapper.spool is None
+        assert wrapper.reads is not reads
+    wrapper.close()
+
+
+@pytest.mark.parametrize('threads', [1, 2, 4])
+def test_parallel_gzip(threads):
+    data = synthetic_reads('FASTQ', n_reads=5000)
+    wrapper = FASTXTranslator(BytesIO(data), threads=threads)
+    output = wrapper.read(1024)
+    output += wrapper.read()
+    assert gzip.GzipFile(fileobj=BytesIO(output)).read() == data
+
+    if threads > 1:
+        # BGZF: every member records its own size and there's an empty member at the end
+        assert output.endswith(BGZF_EOF)
+        offset = 0
+        while offset < len(output):
+            assert output[offset:offset + 4] == b'\x1f\x8b\x08\x04'
+            assert output[offset + 12:offset + 14] == b'BC'
+            offset += struct.unpack('<H', output[offset + 16:offset + 18])[0] + 1
+        assert offset == len(output)
+
+
+class RegexFASTXNuclIterator(FASTXNuclIterator):
+    """The record-by-record regex parser, i.e. the chunk parser always falling back"""
+    def _parse_chunk(self, data, eof):
+        return None
+
+
+def synthetic_reads(file_type, n_reads=20000, read_length=150, alphabet='ACGTN', seed=42):
+    rng = random.Random(seed)
+    seqs = [''.join(rng.choice(alphabet) for _ in range(read_length)).encode()
+            for _ in range(64)]
+    records = []
+    for i in range(n_reads):
+        seq = seqs[i % len(seqs)]
+        if file_type == 'FASTA':
+            records.append(b'>read_' + str(i).encode() + b'\n' + seq + b'\n')
+        else:
+            records.append(b'@read_' + str(i).encode() + b' 1:N:0:1\n' + seq + b'\n+\n' +
+                           b'I' * read_length + b'\n')
+    return b''.join(records)
+
+
+def iterator_throughput(iterator_class, filename, **kwargs):
+    """MB/s (of uncompressed data) it takes to validate `filename`"""
+    with open(filename, 'rb') as f:
+        iterator = iterator_class(f, **kwargs)
+        iterator.buffer_read_size = 1024 * 1024
+        start = time.time()
+        n_bytes = sum(len(chunk.block) for chunk in iterator.iter_chunks())
+    return n_bytes / (1024. * 1024) / max(time.time() - start, 1e-6)
+
+
+@pytest.mark.parametrize('file_type,compressed,alphabet,allow_iupac', [
+    ('FASTA', False, 'ACGTN', False),
+    ('FASTQ', False, 'ACGTN', False),
+    ('FASTQ', True, 'ACGTN', False),
+    ('FASTQ', False, 'ACGTNRYKM', True),
+])
+def test_chunk_parser_throughput(tmpdir, file_type, compressed, alphabet, allow_iupac):
+    # run with `py.test -s` to see the numbers
+    data = synthetic_reads(file_type, alphabet=alphabet)
+    warnings.filterwarnings('ignore', category=ValidationWarning)
+    filename = str(tmpdir.join('reads.fq' if file_type == 'FASTQ' else 'reads.fa'))
+    if compressed:
+        filename += '.gz'
+        with gzip.open(filename, 'wb') as f:
+            f.write(data)
+    else:
+        with open(filename, 'wb') as f:
+            f.write(data)
+
+    # both parsers should give the exact same output
+    chunked = b''.join(c.block for c in FASTXNuclIterator(BytesIO(data),
+                                                          allow_iupac=allow_iupac).iter_chunks())
+    by_record = b''.join(RegexFASTXNuclIterator(BytesIO(data), allow_iupac=allow_iupac))
+    assert chunked == by_record
+
+    regex_rate = iterator_throughput(RegexFASTXNuclIterator, filename, allow_iupac=allow_iupac)
+    chunk_rate = iterator_throughput(FASTXNuclIterator, filename, allow_iupac=allow_iupac)
+    print('\n{}{}{}: regex {:.1f} MB/s, chunked {:.1f} MB/s'.format(
+        file_type, ' (gzip)' if compressed else '', ' (IUPAC)' if allow_iupac else '',
+        regex_rate, chunk_rate
+    ))
+    if not compressed:
+        assert chunk_rate > regex_rate
+
+
+@pytest.mark.parametrize('file_type', ['FASTA', 'FASTQ'])
+def test_buffer_copies(file_type):
+    # records straddling a read boundary shouldn't cause the whole buffer to be copied
+    data = synthetic_reads(file_type)
+    copies = {}
+    for iterator_class in (FASTXNuclIterator, RegexFASTXNuclIterator):
+        iterator = iterator_class(BytesIO(data))
+        iterator.buffer_read_size = 1024 * 16
+        assert b''.join(c.block for c in iterator.iter_chunks()) == data
+        assert iterator.read_bytes == len(data) - 1  # the first byte is read to sniff the type
+        copies[iterator_class] = iterator.copied_bytes_per_mb
+
+    # at most a line or so per read (~64 reads/MB) instead of everything
+    assert copies[FASTXNuclIterator] < 64 * 300
+    assert copies[RegexFASTXNuclIterator] > 1024 * 1024
@@ -4,6 +4,7 @@ from requests_toolbelt import MultipartEncoder
 
 from mock import patch
 import pytest
+import requests
 
 from onecodex.lib.inline_validator import FASTXTranslator
 from onecodex.lib.upload import upload, upload_file, upload_large_file
@@ -96,6 +97,38 @@ def test_upload_small_file():
     file_obj.close()
 
 
+class FlakySession(FakeSession):
+    def __init__(self, n_failures):
+        self.n_failures = n_failures
+        self.uploaded = []
+
+    def post(self, url, **kwargs):
+        if 'data' in kwargs:
+            data = kwargs['data'].read()
+            if self.n_failures > 0:
+                self.n_failures -= 1
+                raise requests.exceptions.ConnectionError()
+            self.uploaded.append(data)
+        return super(FlakySession, self).post(url, **kwargs)
+
+
+def test_upload_retry_reuses_spool():
+    long_seq = b'ACGT' * 50
+    data = b'\n'.join(b'>header_' + str(i).encode() + b'\n' + long_seq + b'\n'
+                      for i in range(200))
+    file_obj = FASTXTranslator(BytesIO(data), spool_size=1024 * 1024)
+    reads = file_obj.reads
+    session = FlakySession(n_failures=1)
+    samples_resource = FakeSamplesResource()
+
+    upload_file(file_obj, 'test.fa', session, samples_resource, None, {}, [])
+
+    # the retry was sent from the spool rather than by re-translating the input
+    assert file_obj.reads is reads
+    assert len(session.uploaded) == 1
+    assert b'\x1f\x8b' in session.uploaded[0]
+
+
 def test_multipart_encoder():
     long_seq = b'ACGT' * 50
     data = b'\n'.join(b'>header_' + str(i).encode() + b'\n' + long_seq + b'\n'